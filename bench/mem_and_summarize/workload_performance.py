@@ -21,32 +21,37 @@ def run_and_measure_pipeline(n_iterations, n_predictions=20):
     """
     ScopeTimer.reset()
 
+    # Build the scope names once so the loop doesn't format strings
+    pred_names = tuple(f"prediction_{j}" for j in range(n_predictions))
+    # Bind the context factory once instead of looking it up per scope
+    profile_block = ScopeTimer.profile_block
+
     # Run the pipeline simulation n_iterations times
     for _ in range(n_iterations):
-        with ScopeTimer.profile_block("pipeline_run"):
+        with profile_block("pipeline_run"):
             # Stage 1: Preprocess (2 sub-scopes)
-            with ScopeTimer.profile_block("preprocess"):
-                with ScopeTimer.profile_block("load_data"):
+            with profile_block("preprocess"):
+                with profile_block("load_data"):
                     pass
-                with ScopeTimer.profile_block("clean_data"):
+                with profile_block("clean_data"):
                     pass
 
             # Stage 2: Compute (includes a loop for sub-nodes)
-            with ScopeTimer.profile_block("compute"):
-                with ScopeTimer.profile_block("feature_extraction"):
+            with profile_block("compute"):
+                with profile_block("feature_extraction"):
                     pass
                 # Loop to simulate multiple low-level operations
-                for j in range(n_predictions):
-                    with ScopeTimer.profile_block(f"prediction_{j}"):
+                for pred_name in pred_names:
+                    with profile_block(pred_name):
                         pass
 
             # Stage 3: Postprocess (1 sub-scope)
-            with ScopeTimer.profile_block("postprocess"):
-                with ScopeTimer.profile_block("save_results"):
+            with profile_block("postprocess"):
+                with profile_block("save_results"):
                     pass
 
     # Measure execution time and final memory impact of summarize()
-    # Suppress console output during timing
+    # Suppress console output during timing; rendering stays in the measurement
     original_stdout = sys.stdout
     sys.stdout = captured_output = io.StringIO()
 
@@ -1,21 +1,47 @@
 import io
 import os
-from typing import Union, Literal, Optional
+import sys
+import weakref
+from typing import TYPE_CHECKING, Callable, Union, Literal, Optional
 from contextlib import nullcontext
 from pathlib import Path
 from functools import wraps
 
-from rich.text import Text
-from rich.panel import Panel
-from rich.rule import Rule
-from rich.console import Console, Group
-
 from scope_timer.node import TimerNode
 from scope_timer.thread_local import TimerThreadLocal
 from scope_timer.infer import infer_time_property
 
+# rich is only needed for reports, so it is imported when the first one is
+# built; measurement-only workloads never pay its import cost.
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+# Module-level handles so the hot path reads globals instead of class attributes.
+_local: TimerThreadLocal = TimerThreadLocal()
+_TIMER_ENABLE: bool = int(os.getenv("SCOPE_TIMER_ENABLE", 1)) != 0
+
+
+# Shared no-op context handed out while profiling is disabled.
+_NULL_CONTEXT = nullcontext()
+
+# Wrappers created by profile_func, mapped to their scope names. Keyed by
+# identity: a function attribute would be copied by any outer @wraps.
+_profiled_wrappers: "weakref.WeakKeyDictionary[Callable, str]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _profiled_scope_name(func: Callable) -> Optional[str]:
+    try:
+        return _profiled_wrappers.get(func)
+    except TypeError:
+        # Not weak-referenceable or not hashable, so not one of ours.
+        return None
+
 
 class _ProfileContext:
+    __slots__ = ["name"]
+
     def __init__(self, name: str):
         self.name = name
 
@@ -27,8 +53,7 @@ class _ProfileContext:
 
 
 class ScopeTimer:
-    _local: TimerThreadLocal = TimerThreadLocal()
-    _TIMER_ENABLE = int(os.getenv("SCOPE_TIMER_ENABLE", 1))
+    _local: TimerThreadLocal = _local
 
     @staticmethod
     def _begin(name: str):
@@ -41,16 +66,22 @@ class ScopeTimer:
             name (str): The name to identify the scope.
         """
 
-        tlocal = ScopeTimer._local
+        tlocal = _local
 
+        # Subscript inside try: a hit (the steady state) is a single dict probe
+        # with no method call or None check; misses create the node once.
         active_node = tlocal.active_node
         if active_node is None:
-            node = tlocal.root_nodes.get(name)
-            if node is None:
+            try:
+                node = tlocal.root_nodes[name]
+            except KeyError:
                 node = TimerNode(name, level=0, parent=None)
                 tlocal.root_nodes[name] = node
         else:
-            node = active_node.get_or_create_branch(name)
+            try:
+                node = active_node.branch_nodes[name]
+            except KeyError:
+                node = active_node.get_or_create_branch(name)
 
         tlocal.active_node = node
         node.begin_record()
@@ -70,7 +101,7 @@ class ScopeTimer:
                 the scope name does not match.
         """
 
-        tlocal = ScopeTimer._local
+        tlocal = _local
 
         active_node = tlocal.active_node
 
@@ -86,7 +117,8 @@ class ScopeTimer:
 
         active_node.end_record()
 
-        tlocal.active_node = None if active_node.is_root else active_node.parent
+        # Root nodes have no parent, so this resets to None for them.
+        tlocal.active_node = active_node.parent
 
     @staticmethod
     def profile_block(name: str):
@@ -99,10 +131,17 @@ class ScopeTimer:
             name (str): The name of the scope to profile.
         """
 
-        if not ScopeTimer._TIMER_ENABLE:
-            return nullcontext()
+        if not _TIMER_ENABLE:
+            return _NULL_CONTEXT
 
-        return _ProfileContext(name)
+        # Contexts only carry the scope name, so one instance per name is
+        # reused instead of allocating a new object on every `with`.
+        contexts = _local.contexts
+        context = contexts.get(name)
+        if context is None:
+            context = _ProfileContext(name)
+            contexts[name] = context
+        return context
 
     @staticmethod
     def profile_func(name: Optional[str] = None):
@@ -116,7 +155,7 @@ class ScopeTimer:
                 the decorated function's name will be used automatically.
         """
 
-        if not ScopeTimer._TIMER_ENABLE:
+        if not _TIMER_ENABLE:
             return lambda f: f
 
         def decorator(func):
@@ -125,14 +164,23 @@ class ScopeTimer:
                 scope_name = name
             else:
                 scope_name = getattr(func, '__name__', 'unknown_scope')
+            # Profiling again under the same name would only nest the scope
+            # inside itself and time every call twice.
+            if _profiled_scope_name(func) == scope_name:
+                return func
+
+            # Resolved once here instead of on every call of the wrapper.
+            begin = ScopeTimer._begin
+            end = ScopeTimer._end
 
             @wraps(func)
             def wrapper(*args, **kwargs):
-                ScopeTimer._begin(scope_name)
+                begin(scope_name)
                 try:
                     return func(*args, **kwargs)
                 finally:
-                    ScopeTimer._end(scope_name)
+                    end(scope_name)
+            _profiled_wrappers[wrapper] = scope_name
             return wrapper
         return decorator
 
@@ -145,11 +193,55 @@ class ScopeTimer:
 
         ScopeTimer._local.reset()
 
+    @staticmethod
+    def _get_console() -> "Console":
+        from rich.console import Console
+
+        tlocal = _local
+        console = tlocal.console
+        # Terminal and color detection happen at construction, so a new
+        # console is only needed when stdout itself has been swapped.
+        if console is None or console.file is not sys.stdout:
+            console = Console(file=sys.stdout)
+            # Only the real stdout is cached; holding on to a redirected
+            # stream would keep its buffer alive after summarize() returns.
+            tlocal.console = console if sys.stdout is sys.__stdout__ else None
+        return console
+
+    @staticmethod
+    def _get_txt_console() -> "Console":
+        from rich.console import Console
+
+        tlocal = _local
+        console = tlocal.txt_console
+        if console is None:
+            # Output is always captured, so the file is never written to.
+            console = Console(
+                file=io.StringIO(), color_system=None, force_terminal=False)
+            tlocal.txt_console = console
+        return console
+
+    @staticmethod
+    def _get_html_console() -> "Console":
+        from rich.console import Console
+
+        tlocal = _local
+        console = tlocal.html_console
+        if console is None:
+            console = Console(record=True, file=io.StringIO())
+            tlocal.html_console = console
+        return console
+
     @staticmethod
     def _create_rich_group(
             verbose: bool = False,
             divider: Literal["rule", "blank"] = "blank"
     ):
+        from rich.console import Group
+        from rich.panel import Panel
+        from rich.rule import Rule
+        from rich.text import Text
+
         tlocal = ScopeTimer._local
         overall_time: float = 0.
 
@@ -163,9 +255,11 @@ class ScopeTimer:
         items.append(title)
 
         tree_list = []
-        warn_list: list[Text] = []
+        warn_list: list["Text"] = []
         for root_node in tlocal.root_nodes.values():
-            tree = root_node.to_tree(time_property, verbose=verbose)
+            open_nodes: list[TimerNode] = []
+            tree = root_node.to_tree(
+                time_property, verbose=verbose, open_nodes=open_nodes)
             tree_list.append(tree)
             if divider == "rule":
                 tree_list.append(Rule(style="grey50"))
@@ -173,7 +267,7 @@ class ScopeTimer:
                 tree_list.append(Text())
             overall_time += root_node.total_time
 
-            for open_node in root_node.get_open_nodes():
+            for open_node in open_nodes:
                 warn_msg = Text(
                     f"- unclosed scope: '{open_node.name}'",
                     style="yellow")
@@ -212,8 +306,7 @@ class ScopeTimer:
 
         worst_time: float = 0.
         for root_node in tlocal.root_nodes.values():
-            if not root_node.preprocessed:
-                root_node.build_stats_recursive()
+            root_node.build_stats_recursive()
 
             if root_node.total_time > worst_time:
                 worst_time = root_node.total_time
@@ -224,6 +317,26 @@ class ScopeTimer:
             precision
         )
 
+    @staticmethod
+    def get_stats() -> dict[str, dict]:
+        """Returns the timing results as nested dictionaries.
+
+        Unlike `summarize()`, no rich renderables are built, which makes this
+        suitable for programmatic access or automated checks.
+
+        Returns:
+            dict: A mapping from each root scope name to its statistics. Each
+                entry holds 'ncall', 'total', 'min', 'max' and 'avg' (in
+                seconds), 'var' (the population variance, in seconds squared)
+                and a 'children' mapping of the same shape.
+        """
+
+        stats: dict[str, dict] = {}
+        for name, root_node in _local.root_nodes.items():
+            root_node.build_stats_recursive()
+            stats[name] = root_node.to_dict()
+        return stats
+
     @staticmethod
     def summarize(
         time_unit: Literal["auto", "s", "ms", "us"] = "auto",
@@ -247,7 +360,7 @@ class ScopeTimer:
         ScopeTimer._preprocess(time_unit, precision)
         group = ScopeTimer._create_rich_group(
             verbose=verbose, divider=divider)
-        console = Console()
+        console = ScopeTimer._get_console()
         console.print(group)
 
     @staticmethod
@@ -274,9 +387,11 @@ class ScopeTimer:
         group = ScopeTimer._create_rich_group(
             verbose=verbose, divider="blank")
 
-        with path.open("w", encoding="utf-8") as f:
-            console = Console(file=f, color_system=None, force_terminal=False)
+        # Render fully in memory, then write the file in a single call.
+        console = ScopeTimer._get_txt_console()
+        with console.capture() as capture:
             console.print(group)
+        path.write_text(capture.get(), encoding="utf-8")
 
     @staticmethod
     def save_html(
@@ -302,8 +417,29 @@ class ScopeTimer:
         group = ScopeTimer._create_rich_group(
             verbose=verbose, divider="blank")
 
-        sink = io.StringIO()
-        console = Console(record=True, file=sink)
+        console = ScopeTimer._get_html_console()
         console.print(group)
         html = console.export_html()
+        # The sink only swallows the live output; don't keep the report around.
+        sink = console.file
+        sink.seek(0)
+        sink.truncate()
         path.write_text(html, encoding="utf-8")
+
+
+# wraps() keeps the public docstrings and signatures for help() and IDEs.
+@wraps(ScopeTimer.profile_block)
+def _disabled_profile_block(name: str):
+    return _NULL_CONTEXT
+
+
+@wraps(ScopeTimer.profile_func)
+def _disabled_profile_func(name: Optional[str] = None):
+    return lambda f: f
+
+
+if not _TIMER_ENABLE:
+    # Disabled for the whole process: bind stubs once at import time so each
+    # call skips the flag check and hands back shared no-op objects.
+    ScopeTimer.profile_block = staticmethod(_disabled_profile_block)
+    ScopeTimer.profile_func = staticmethod(_disabled_profile_func)
@@ -1,5 +1,5 @@
-import math
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Literal, Union
 
 
@@ -8,10 +8,15 @@ class TimeProperty:
     unit: Literal["s", "ms", "us"]
     scale: int
     precision: int
+    _template: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Built once so format_time() doesn't re-parse a nested format spec.
+        object.__setattr__(
+            self, "_template", f"%.{self.precision}f{self.unit}")
 
     def format_time(self, second_time: float) -> str:
-        scaled = second_time * self.scale
-        return f"{scaled:.{self.precision}f}{self.unit}"
+        return self._template % (second_time * self.scale)
 
 
 def _infer_time_unit(
@@ -32,46 +37,45 @@ def _infer_time_unit(
         return "us"
 
 
+_TIME_SCALES: dict[str, int] = {
+    "s": 1,
+    "ms": 1_000,
+    "us": 1_000_000,
+}
+
+
 def _infer_time_scaling(
     time_unit: Literal["s", "ms", "us"]
 ) -> int:
-    match time_unit:
-        case "s":
-            return 1
-        case "ms":
-            return 1_000
-        case "us":
-            return 1_000_000
+    return _TIME_SCALES[time_unit]
 
 
 def _num_digits(n: float) -> int:
     n_int = int(n)
     if n_int == 0:
-        return 0  # pragma: no cover
-    return int(math.log10(abs(n_int))) + 1
+        return 0
+    # Counting decimal characters is exact; log10 rounds up just below
+    # large powers of ten (e.g. 10**15 - 1).
+    return len(str(abs(n_int)))
 
 
-def _infer_time_precision(
-    second_time: float,
+def _precision_from_digits(
+    digit: int,
     time_unit: Literal["s", "ms", "us"],
-    scale: int,
     precision: Union[int, Literal["auto"]]
 ) -> int:
     if isinstance(precision, int):
         return precision
 
-    scaled_time = second_time * scale
-
     if time_unit == "us":
         return 1
 
     precision_cap = 6
-    digit = _num_digits(scaled_time)
 
     if digit >= precision_cap:
         return 0
     if digit <= 0:
-        return precision_cap  # pragma: no cover
+        return precision_cap
 
     return precision_cap - digit
 
@@ -83,11 +87,21 @@ def infer_time_property(
 ) -> TimeProperty:
     time_unit = _infer_time_unit(worst_time, unit)
     time_scale = _infer_time_scaling(time_unit)
-    time_precision = _infer_time_precision(
-        worst_time, time_unit, time_scale, precision)
+    # The worst time only matters through its unit and digit count, so the
+    # cache is keyed on those and near-equal values share one entry.
+    digit = _num_digits(worst_time * time_scale)
+    return _make_time_property(time_unit, digit, precision)
+
 
+# TimeProperty is frozen, so every report in the same class can share it.
+@lru_cache(maxsize=128)
+def _make_time_property(
+    time_unit: Literal["s", "ms", "us"],
+    digit: int,
+    precision: Union[int, Literal["auto"]]
+) -> TimeProperty:
     return TimeProperty(
         unit=time_unit,
-        scale=time_scale,
-        precision=time_precision
+        scale=_infer_time_scaling(time_unit),
+        precision=_precision_from_digits(digit, time_unit, precision)
     )
@@ -1,35 +1,43 @@
-import time
-from typing import Optional
-
-from rich.text import Text
-from rich.tree import Tree
+from array import array
+from operator import mul, sub
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Iterator, Optional
 
 from scope_timer.record import TimerRecord
 from scope_timer.stats import TimerStats
 from scope_timer.infer import TimeProperty
 
+if TYPE_CHECKING:
+    from rich.text import Text
+    from rich.tree import Tree
+
+# Timestamps are stored as integer nanoseconds and converted on read.
+NS_PER_SECOND = 1_000_000_000
+
 
 class TimerNode:
     name: str
-    records: list[TimerRecord]
+    begins: array
+    ends: array
     level: int
     branch_nodes: dict[str, "TimerNode"]
     parent: Optional["TimerNode"]
-    ncall: int
     is_root: bool
     stats: Optional[TimerStats]
     preprocessed: bool
+    label_cache: Optional[tuple[tuple, "Text"]]
 
     __slots__ = [
         "name",
-        "records",
+        "begins",
+        "ends",
         "level",
         "branch_nodes",
         "parent",
-        "ncall",
         "is_root",
         "stats",
-        "preprocessed"
+        "preprocessed",
+        "label_cache"
     ]
 
     def __init__(
@@ -39,23 +47,39 @@ class TimerNode:
         parent: Optional["TimerNode"] = None,
     ):
         self.name = name
-        self.records = []
+        self.begins = array("q")
+        self.ends = array("q")
         self.level = level
         self.branch_nodes = {}
         self.parent = parent
-        self.ncall = 0
         self.is_root = True if level == 0 else False
         self.stats = None
         self.preprocessed = False
+        self.label_cache = None
 
-    def begin_record(self):
-        self.records.append(
-            TimerRecord(begin=time.perf_counter())
+    @property
+    def ncall(self) -> int:
+        # Each completed call contributes exactly one end timestamp.
+        return len(self.ends)
+
+    @property
+    def records(self) -> list[TimerRecord]:
+        records = [
+            TimerRecord(begin / NS_PER_SECOND, end / NS_PER_SECOND)
+            for begin, end in zip(self.begins, self.ends)
+        ]
+        # An open record has a begin timestamp but no end yet.
+        records.extend(
+            TimerRecord(begin / NS_PER_SECOND)
+            for begin in self.begins[len(self.ends):]
         )
+        return records
+
+    def begin_record(self):
+        self.begins.append(perf_counter_ns())
 
     def end_record(self):
-        self.records[self.ncall].end = time.perf_counter()
-        self.ncall += 1
+        self.ends.append(perf_counter_ns())
         self.preprocessed = False
 
     def get_or_create_branch(self, name: str) -> "TimerNode":
@@ -72,29 +96,49 @@ class TimerNode:
         max_time_length: int,
         max_ncall_length: int,
         verbose: bool = False):
-        label = Text()
+        # Everything the label depends on; stats are frozen and compare by value.
+        parent_total = self.parent.total_time if self.parent else None
+        key = (self.stats, self.ncall, parent_total, time_property,
+               max_label_length, max_time_length, max_ncall_length, verbose)
+        cached = self.label_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        # Imported here so that recording never loads rich.
+        from rich.text import Span, Text
+
+        format_time = time_property.format_time
 
         node_label = f"[{self.name}]"
 
         # +3: for brackets and spacing
-        label.append(f"{node_label:<{max_label_length+3}}", style="green")
-        label.append(f"{time_property.format_time(self.total_time):>{max_time_length}} ")
-        label.append(f"/ ")
-        label.append(f"{self.ncall:>{max_ncall_length}}x ")
-
+        parts = [
+            f"{node_label:<{max_label_length+3}}",
+            f"{format_time(self.total_time):>{max_time_length}} / "
+            f"{self.ncall:>{max_ncall_length}}x "
+        ]
         if self.parent:
             if self.parent.total_time > 0:
                 percent = round(self.total_time / self.parent.total_time * 100)
-                label.append(f"({percent}%) ")
+                parts.append(f"({percent}%) ")
             else:
-                label.append("(--%) ")
+                parts.append("(--%) ")
         if verbose:
-            label.append(" [")
-            label.append(f"min={time_property.format_time(self.min_time)}, ")
-            label.append(f"max={time_property.format_time(self.max_time)}, ")
-            label.append(f"avg={time_property.format_time(self.avg_time)}, ")
-            label.append(f"var={time_property.format_time(self.var_time)}")
-            label.append("]")
+            parts.append(
+                f" [min={format_time(self.min_time)}, "
+                f"max={format_time(self.max_time)}, "
+                f"avg={format_time(self.avg_time)}, "
+                f"var={format_time(self.var_time)}]"
+            )
+
+        # One plain string with a single green span over the name column.
+        # Markup is avoided on purpose: the name is wrapped in brackets.
+        label = Text(
+            "".join(parts), spans=[Span(0, len(parts[0]), "green")])
+
+        # Only cache labels backed by built stats, which change only on rebuild.
+        if self.stats is not None:
+            self.label_cache = (key, label)
         return label
 
     def to_tree(
@@ -103,8 +147,11 @@ class TimerNode:
         max_label_length: Optional[int] = None,
         max_time_length: Optional[int] = None,
         max_ncall_length: Optional[int] = None,
-        verbose: bool = False
-    ) -> Tree:
+        verbose: bool = False,
+        open_nodes: Optional[list["TimerNode"]] = None
+    ) -> "Tree":
+        from rich.tree import Tree
+
         if max_label_length is None:
             max_label_length = len(self.name)
         if max_time_length is None:
@@ -112,7 +159,7 @@ class TimerNode:
         if max_ncall_length is None:
             max_ncall_length = len(str(self.ncall))
 
-        tree = Tree(
+        root_tree = Tree(
             self.render_label(
                 time_property,
                 max_label_length,
@@ -122,105 +169,155 @@ class TimerNode:
             guide_style="bright_blue"
         )
 
-        if len(self.branch_nodes) > 0:
-            max_label_length = max(len(node.name) for node in self.branch_nodes.values())
-            max_time_length = max(len(time_property.format_time(node.total_time)) for node in self.branch_nodes.values())
-            max_ncall_length = max(len(str(node.ncall)) for node in self.branch_nodes.values())
-        else:
-            max_label_length = None
-            max_time_length = None
-            max_ncall_length = None
-
-        for branch_node in self.branch_nodes.values():
-            tree.add(
-                branch_node.to_tree(
-                    time_property,
-                    max_label_length,
-                    max_time_length,
-                    max_ncall_length,
-                    verbose=verbose))
-        return tree
+        format_time = time_property.format_time
+
+        # Iterative walk: each entry pairs a node with its already-built tree.
+        stack: list[tuple["TimerNode", "Tree"]] = [(self, root_tree)]
+        while stack:
+            node, tree = stack.pop()
+            # Collect unclosed scopes during the same walk (depth-first order).
+            if open_nodes is not None and node.has_open_record():
+                open_nodes.append(node)
+
+            branch_nodes = node.branch_nodes.values()
+            if len(branch_nodes) == 0:
+                continue
+
+            # Column widths for this level in a single pass over the branches.
+            max_label_length = max_time_length = max_ncall_length = 0
+            for branch in branch_nodes:
+                label_length = len(branch.name)
+                if label_length > max_label_length:
+                    max_label_length = label_length
+                time_length = len(format_time(branch.total_time))
+                if time_length > max_time_length:
+                    max_time_length = time_length
+                ncall_length = len(str(branch.ncall))
+                if ncall_length > max_ncall_length:
+                    max_ncall_length = ncall_length
+
+            children = []
+            for branch_node in branch_nodes:
+                branch_tree = tree.add(
+                    branch_node.render_label(
+                        time_property,
+                        max_label_length,
+                        max_time_length,
+                        max_ncall_length,
+                        verbose=verbose),
+                    guide_style="bright_blue"
+                )
+                children.append((branch_node, branch_tree))
+            # Reversed so the first branch is popped (and visited) first.
+            stack.extend(reversed(children))
+        return root_tree
+
+    def _stats_dict(self) -> dict:
+        return {
+            "ncall": self.ncall,
+            "total": self.total_time,
+            "min": self.min_time,
+            "max": self.max_time,
+            "avg": self.avg_time,
+            "var": self.var_time,
+            "children": {},
+        }
+
+    def to_dict(self) -> dict:
+        root_dict = self._stats_dict()
+        stack: list[tuple["TimerNode", dict]] = [(self, root_dict)]
+        while stack:
+            node, node_dict = stack.pop()
+            children = node_dict["children"]
+            for name, branch_node in node.branch_nodes.items():
+                branch_dict = branch_node._stats_dict()
+                children[name] = branch_dict
+                stack.append((branch_node, branch_dict))
+        return root_dict
 
     def has_open_record(self) -> bool:
-        return self.ncall < len(self.records)
-
-    def get_open_nodes(self) -> list["TimerNode"]:
-        open_nodes: list["TimerNode"] = []
-
-        if self.has_open_record():
-            open_nodes.append(self)
-
-        for branch_node in self.branch_nodes.values():
-            open_nodes.extend(branch_node.get_open_nodes())
-        return open_nodes
+        return len(self.ends) != len(self.begins)
 
-    def _get_total_time(self) -> float:
-        if self.ncall == 0:
-            return 0.
-        return sum(r.elapsed for r in self.records[:self.ncall])
+    def iter_nodes(self) -> Iterator["TimerNode"]:
+        # Depth-first pre-order without recursion.
+        stack: list["TimerNode"] = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.branch_nodes.values()))
 
-    def _get_min_time(self) -> float:
-        if self.ncall == 0:
-            return 0.
-        return min(r.elapsed for r in self.records[:self.ncall])
-
-    def _get_max_time(self) -> float:
-        if self.ncall == 0:
-            return 0.
-        return max(r.elapsed for r in self.records[:self.ncall])
+    def get_open_nodes(self) -> list["TimerNode"]:
+        return [node for node in self.iter_nodes() if node.has_open_record()]
 
-    def _get_avg_time(self) -> float:
-        if self.ncall == 0:
-            return 0.
-        return self._get_total_time() / self.ncall
+    def _get_elapsed(self) -> list[int]:
+        # `ends` only holds completed calls, so open records are skipped here.
+        return list(map(sub, self.ends, self.begins))
 
-    def _get_var_time(self) -> float:
-        if self.ncall < 2:
-            return 0.
-        avg = self._get_avg_time()
-        return sum((r.elapsed - avg) ** 2 for r in self.records[:self.ncall]) / self.ncall
+    def _get_stats(self) -> TimerStats:
+        # Built on first access and reused until end_record() marks it stale.
+        stats = self.stats
+        if stats is None or not self.preprocessed:
+            stats = self._build_stats()
+        return stats
 
     @property
     def total_time(self) -> float:
-        if self.stats is None:
-            return self._get_total_time()
-        return self.stats.total
+        return self._get_stats().total
 
     @property
     def min_time(self) -> float:
-        if self.stats is None:
-            return self._get_min_time()
-        return self.stats.min_
+        return self._get_stats().min_
 
     @property
     def max_time(self) -> float:
-        if self.stats is None:
-            return self._get_max_time()
-        return self.stats.max_
+        return self._get_stats().max_
 
     @property
     def avg_time(self) -> float:
-        if self.stats is None:
-            return self._get_avg_time()
-        return self.stats.avg
+        return self._get_stats().avg
 
     @property
     def var_time(self) -> float:
-        if self.stats is None:
-            return self._get_var_time()
-        return self.stats.var_
-
-    def _build_stats(self):
-        self.stats = TimerStats(
-            total=self._get_total_time(),
-            min_=self._get_min_time(),
-            max_=self._get_max_time(),
-            avg=self._get_avg_time(),
-            var_=self._get_var_time()
-        )
+        return self._get_stats().var_
+
+    def _build_stats(self) -> TimerStats:
+        ncall = self.ncall
+        if ncall == 0:
+            stats = TimerStats(total=0., min_=0., max_=0., avg=0., var_=0.)
+        elif ncall == 1:
+            # One-shot scopes (e.g. top-level phases) need no reductions.
+            elapsed_s = (self.ends[0] - self.begins[0]) / NS_PER_SECOND
+            stats = TimerStats(
+                total=elapsed_s, min_=elapsed_s, max_=elapsed_s,
+                avg=elapsed_s, var_=0.)
+        else:
+            # Materialize the elapsed times once and run every reduction over
+            # it. Sums stay exact in integer nanoseconds until the conversion.
+            elapsed = self._get_elapsed()
+            total_ns = sum(elapsed)
+            stats = TimerStats(
+                total=total_ns / NS_PER_SECOND,
+                min_=min(elapsed) / NS_PER_SECOND,
+                max_=max(elapsed) / NS_PER_SECOND,
+                avg=total_ns / ncall / NS_PER_SECOND,
+                var_=_variance(elapsed, total_ns) / NS_PER_SECOND ** 2
+            )
+
+        self.stats = stats
+        self.preprocessed = True
+        return stats
 
     def build_stats_recursive(self):
-        self._build_stats()
-        for branch_node in self.branch_nodes.values():
-            branch_node.build_stats_recursive()
-        self.preprocessed = True
+        # Every node is visited, but only those with new calls since their
+        # last build (end_record() clears `preprocessed`) are recomputed.
+        for node in self.iter_nodes():
+            if not node.preprocessed:
+                node._build_stats()
+
+
+def _variance(elapsed: list[int], total: int) -> float:
+    # Sum of squares in one C-level pass; independent of the mean, so it can
+    # reuse the total. Integer arithmetic keeps n*sum(x^2) - sum(x)^2 exact.
+    n = len(elapsed)
+    sum_sq = sum(map(mul, elapsed, elapsed))
+    return (n * sum_sq - total * total) / (n * n)
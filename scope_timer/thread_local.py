@@ -1,21 +1,37 @@
 import threading
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from scope_timer.node import TimerNode
 from scope_timer.infer import TimeProperty
 
+if TYPE_CHECKING:
+    from rich.console import Console
+    from scope_timer.core import _ProfileContext
+
 
 class TimerThreadLocal(threading.local):
     active_node: Optional[TimerNode]
     root_nodes: dict[str, TimerNode]
     time_property: Optional[TimeProperty]
+    contexts: dict[str, "_ProfileContext"]
+    console: Optional["Console"]
+    txt_console: Optional["Console"]
+    html_console: Optional["Console"]
 
     def __init__(self):
         self.active_node = None
         self.root_nodes = {}
         self.time_property = None
+        self.contexts = {}
+        self.console = None
+        self.txt_console = None
+        self.html_console = None
 
     def reset(self):
         self.active_node = None
         self.root_nodes.clear()
+        self.contexts.clear()
         self.time_property = None
+        self.console = None
+        self.txt_console = None
+        self.html_console = None
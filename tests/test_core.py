@@ -1,8 +1,16 @@
+import contextlib
+import functools
+import io
+import os
+import subprocess
+import sys
 import pytest
 import time
 from pathlib import Path
 
 from scope_timer import ScopeTimer
+from scope_timer import core
+from scope_timer.node import NS_PER_SECOND, TimerNode
 
 # Tolerance for time.sleep() inaccuracy, set to 10%
 TOLERANCE = 0.1
@@ -65,6 +73,7 @@ def test_reset():
     assert "test_reset" in ScopeTimer._local.root_nodes
     ScopeTimer.reset()
     assert not ScopeTimer._local.root_nodes
+    assert not ScopeTimer._local.contexts
 
 def test_fixed_unfinished_scope_bug():
     """Ensures the previously fixed 'unfinished scope' bug does not regress."""
@@ -107,9 +116,10 @@ def test_save_txt(tmp_path: Path):
     ScopeTimer.save_txt(file_path, verbose=True)
 
     assert file_path.exists()
-    assert file_path.read_text()
-    assert "save_test" in file_path.read_text()
-    assert "avg=" in file_path.read_text() # Check verbose output
+    content = file_path.read_text()
+    assert content
+    assert "save_test" in content
+    assert "avg=" in content # Check verbose output
 
 def test_save_html(tmp_path: Path):
     """Checks that save_html() creates a non-empty HTML file."""
@@ -165,13 +175,15 @@ def test_profiling_disabled_by_env_var(monkeypatch):
     This requires reloading the module to respect the environment variable.
     """
     # _TIMER_ENABLEフラグを直接0に書き換える
-    monkeypatch.setattr(ScopeTimer, "_TIMER_ENABLE", 0)
+    monkeypatch.setattr(core, "_TIMER_ENABLE", False)
 
     with ScopeTimer.profile_block("should_not_be_recorded"):
         time.sleep(0.01)
 
     # Verify no scopes were created
     assert not ScopeTimer._local.root_nodes
+    # Every disabled block shares one no-op context
+    assert ScopeTimer.profile_block("a") is ScopeTimer.profile_block("b")
 
 def test_profile_func_decorator_with_inferred_name():
     """
@@ -217,13 +229,55 @@ def test_profile_func_preserves_function_metadata():
     assert function_with_docstring.__name__ == "function_with_docstring"
     assert function_with_docstring.__doc__ == "This is a test docstring."
 
+def test_profile_func_does_not_rewrap_same_scope():
+    """Checks that re-applying profile_func with the same name keeps one scope."""
+    @ScopeTimer.profile_func("rewrap_scope")
+    def rewrapped():
+        return 1
+
+    assert ScopeTimer.profile_func("rewrap_scope")(rewrapped) is rewrapped
+    nested = ScopeTimer.profile_func("outer_scope")(rewrapped)
+    assert nested is not rewrapped
+
+    rewrapped()
+    nested()
+
+    node = ScopeTimer._local.root_nodes["rewrap_scope"]
+    assert node.ncall == 1
+    assert not node.branch_nodes
+    assert ScopeTimer._local.root_nodes["outer_scope"].branch_nodes["rewrap_scope"].ncall == 1
+
+def test_profile_func_wraps_third_party_wrapper_of_profiled_function():
+    """Checks that an outer @wraps decorator does not hide the outer scope."""
+    @ScopeTimer.profile_func("wrapped_scope")
+    def inner():
+        return 1
+
+    def retry(func):
+        @functools.wraps(func)
+        def retrying(*args, **kwargs):
+            for _ in range(2):
+                func(*args, **kwargs)
+            return func(*args, **kwargs)
+        return retrying
+
+    retried = retry(inner)
+    outer = ScopeTimer.profile_func("wrapped_scope")(retried)
+    assert outer is not retried
+
+    outer()
+
+    stats = ScopeTimer.get_stats()["wrapped_scope"]
+    assert stats["ncall"] == 1
+    assert stats["children"]["wrapped_scope"]["ncall"] == 3
+
 def test_profile_func_is_noop_when_disabled(monkeypatch):
     """
     Checks that the @profile_func decorator does nothing and returns the
     original function when the timer is disabled. This covers the disabled path.
     """
     # Temporarily disable the timer by patching the internal flag
-    monkeypatch.setattr(ScopeTimer, "_TIMER_ENABLE", 0)
+    monkeypatch.setattr(core, "_TIMER_ENABLE", False)
 
     @ScopeTimer.profile_func()
     def undecorated_equivalent_function():
@@ -235,3 +289,138 @@ def test_profile_func_is_noop_when_disabled(monkeypatch):
 
     # Verify that no profiling data was recorded
     assert not ScopeTimer._local.root_nodes
+
+def test_profile_block_reuses_context_per_name():
+    """Checks that profile_block() hands back the same context object for a name."""
+    first = ScopeTimer.profile_block("reused")
+    second = ScopeTimer.profile_block("reused")
+    assert first is second
+    assert ScopeTimer.profile_block("other") is not first
+
+    # A cached context must still be usable for nested, repeated entries
+    with first:
+        with ScopeTimer.profile_block("other"):
+            pass
+    with second:
+        pass
+
+    node = ScopeTimer._local.root_nodes["reused"]
+    assert node.ncall == 2
+    assert node.branch_nodes["other"].ncall == 1
+
+def test_save_html_reuses_console_without_retaining_output(tmp_path: Path):
+    """Checks that save_html() reuses its console but keeps no report text."""
+    with ScopeTimer.profile_block("html_scope"):
+        pass
+    ScopeTimer.save_html(tmp_path / "first.html")
+    console = ScopeTimer._local.html_console
+    assert console.file.getvalue() == ""
+
+    ScopeTimer.save_html(tmp_path / "second.html")
+    assert ScopeTimer._local.html_console is console
+    first = (tmp_path / "first.html").read_text()
+    second = (tmp_path / "second.html").read_text()
+    assert second.count("html_scope") == first.count("html_scope")
+
+    ScopeTimer.reset()
+    assert ScopeTimer._local.html_console is None
+
+def test_summarize_follows_redirected_stdout(capsys):
+    """Checks that the cached console is rebuilt when stdout is swapped."""
+    with ScopeTimer.profile_block("redirected"):
+        pass
+    ScopeTimer.summarize()
+    assert "redirected" in capsys.readouterr().out
+
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        ScopeTimer.summarize()
+    assert "redirected" in buffer.getvalue()
+    assert "redirected" not in capsys.readouterr().out
+    # A console bound to a redirected stream is not kept
+    assert ScopeTimer._local.console is None
+
+def test_get_stats_returns_nested_dicts():
+    """Checks that get_stats() mirrors the scope tree without rendering."""
+    for _ in range(2):
+        with ScopeTimer.profile_block("outer"):
+            with ScopeTimer.profile_block("inner"):
+                time.sleep(0.001)
+
+    stats = ScopeTimer.get_stats()
+
+    assert list(stats) == ["outer"]
+    outer = stats["outer"]
+    inner = outer["children"]["inner"]
+    assert outer["ncall"] == 2
+    assert inner["ncall"] == 2
+    assert inner["children"] == {}
+    assert outer["total"] >= inner["total"] >= 0.002
+    assert inner["min"] <= inner["avg"] <= inner["max"]
+    assert ScopeTimer._local.time_property is None
+
+def test_disabled_at_import_binds_noop_stubs():
+    """
+    Checks that SCOPE_TIMER_ENABLE=0 at import time swaps in no-op stubs.
+    A subprocess is used because the switch is only read on import.
+    """
+    code = (
+        "from scope_timer import ScopeTimer\n"
+        "from scope_timer import core\n"
+        "assert ScopeTimer.profile_block('a') is ScopeTimer.profile_block('b')\n"
+        "with ScopeTimer.profile_block('a'):\n"
+        "    pass\n"
+        "def f():\n"
+        "    return 1\n"
+        "assert ScopeTimer.profile_func()(f) is f\n"
+        "assert not core._local.root_nodes\n"
+        "assert ScopeTimer.profile_block.__doc__.startswith('Profiles a block')\n"
+        "assert ScopeTimer.profile_func.__doc__.startswith('Profiles a function')\n"
+    )
+    env = dict(os.environ, SCOPE_TIMER_ENABLE="0")
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+def test_get_stats_reports_variance_in_seconds_squared():
+    """Checks that 'var' is the population variance of the durations in s^2."""
+    node = TimerNode("var_scope")
+    node.begins.extend([0, 0])
+    node.ends.extend([1 * NS_PER_SECOND, 3 * NS_PER_SECOND])
+    ScopeTimer._local.root_nodes["var_scope"] = node
+
+    stats = ScopeTimer.get_stats()["var_scope"]
+    assert stats["avg"] == 2.0
+    assert stats["var"] == 1.0
+
+def test_stats_refresh_for_children_of_open_root():
+    """
+    Checks that stats are rebuilt for branches that gained calls while their
+    root stayed open, even though the root itself was not modified.
+    """
+    ScopeTimer._begin("open_parent")
+    with ScopeTimer.profile_block("child"):
+        pass
+    first = ScopeTimer.get_stats()
+    assert first["open_parent"]["children"]["child"]["ncall"] == 1
+
+    with ScopeTimer.profile_block("child"):
+        time.sleep(0.001)
+    second = ScopeTimer.get_stats()
+    child = second["open_parent"]["children"]["child"]
+    assert child["ncall"] == 2
+    assert child["total"] >= 0.001
+
+
+def test_import_does_not_load_rich():
+    """Checks that rich is only imported once a report is built."""
+    code = (
+        "import sys\n"
+        "from scope_timer import ScopeTimer\n"
+        "with ScopeTimer.profile_block('a'):\n"
+        "    pass\n"
+        "assert ScopeTimer.get_stats()['a']['ncall'] == 1\n"
+        "assert 'rich' not in sys.modules\n"
+        "ScopeTimer.summarize()\n"
+        "assert 'rich' in sys.modules\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True)
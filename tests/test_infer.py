@@ -1,5 +1,5 @@
 import pytest
-from scope_timer.infer import infer_time_property, _infer_time_unit, _infer_time_precision, _num_digits
+from scope_timer.infer import TimeProperty, infer_time_property, _infer_time_unit, _num_digits
 
 @pytest.mark.parametrize("time_input, expected_unit", [
     (1.5, "s"),
@@ -22,6 +22,7 @@ def test_infer_time_unit(time_input, expected_unit):
     (0.0, "auto", "auto", "us", 1),     # Zero time
     (1_234_567.0, "auto", "auto", "s", 0),  # digit >= precision_cap
     (0.0000005, "auto", "auto", "us", 1),  # digit <= 0
+    (0.5, "s", "auto", "s", 6),         # Forced unit, sub-unit time: digit <= 0
 ])
 def test_infer_time_property(worst_time, unit, precision, expected_unit, expected_precision):
     """Checks the whole inference pipeline for units and precision."""
@@ -35,7 +36,41 @@ def test_infer_time_property(worst_time, unit, precision, expected_unit, expecte
 ])
 def test_num_digits_for_sub_one_value(n, expected):
     """
-    Directly tests the _num_digits branch for numbers < 1.
-    This covers line 50, accepting it's currently dormant.
+    Directly tests the _num_digits branch for numbers < 1, which
+    infer_time_property reaches for zero or sub-unit worst times.
     """
     assert _num_digits(n) == expected
+
+
+def test_infer_time_property_is_cached():
+    """Checks that identical arguments reuse the same TimeProperty instance."""
+    first = infer_time_property(0.25, "auto", "auto")
+    assert infer_time_property(0.25, "auto", "auto") is first
+    assert infer_time_property(0.25, "s", "auto") is not first
+
+
+def test_time_property_format_time():
+    """Checks formatting with the precomputed template and value equality."""
+    prop = infer_time_property(0.5, "ms", 2)
+    assert prop.format_time(0.0123456) == "12.35ms"
+    assert prop == TimeProperty(unit="ms", scale=1_000, precision=2)
+
+
+def test_infer_time_property_shares_digit_class():
+    """Checks that worst times with the same unit and digit count share a cache entry."""
+    first = infer_time_property(0.0251, "auto", "auto")
+    assert infer_time_property(0.0259, "auto", "auto") is first
+    assert infer_time_property(0.251, "auto", "auto") is not first
+
+
+@pytest.mark.parametrize("n, expected", [
+    (1.0, 1),
+    (9.99, 1),
+    (10.0, 2),
+    (123456.7, 6),
+    (10**15 - 1, 15),
+    (10**15, 16),
+])
+def test_num_digits(n, expected):
+    """Checks digit counts, including values just below a large power of ten."""
+    assert _num_digits(n) == expected
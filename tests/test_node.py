@@ -1,3 +1,4 @@
+import sys
 import pytest
 from io import StringIO
 
@@ -20,8 +21,8 @@ def test_get_or_create_branch():
 def test_node_stats_with_no_calls():
     """Checks that stats are zero if no calls were completed."""
     node = TimerNode("test")
-    # Add a record but don't call end_record(), so ncall remains 0
-    node.records.append(TimerRecord(begin=1.0, end=None))
+    # Add a begin timestamp but don't call end_record(), so ncall remains 0
+    node.begins.append(1_000_000_000)
 
     assert node.ncall == 0
     node.build_stats_recursive()
@@ -102,16 +103,160 @@ def test_properties_without_preprocessed_stats():
 
     # Manually add records without calling build_stats_recursive()
     # This ensures node.stats remains None
-    node.records = [
-        TimerRecord(begin=1.0, end=1.1), # 0.1
-        TimerRecord(begin=2.0, end=2.3), # 0.3
-    ]
-    node.ncall = 2
+    node.begins.extend([1_000_000_000, 2_000_000_000])
+    node.ends.extend([1_100_000_000, 2_300_000_000]) # 0.1s, 0.3s
 
-    # Accessing properties should trigger the _get_* methods
+    # Accessing properties should build the stats on demand
     assert node.stats is None
     assert pytest.approx(node.total_time) == 0.4
     assert pytest.approx(node.min_time) == 0.1
     assert pytest.approx(node.max_time) == 0.3
     assert pytest.approx(node.avg_time) == 0.2
     assert node.var_time > 0
+
+def test_records_view_includes_open_record():
+    """Checks that the records view pairs timestamps and keeps open records."""
+    node = TimerNode("test")
+    node.begins.extend([1_000_000_000, 2_000_000_000, 3_000_000_000])
+    node.ends.extend([1_500_000_000, 2_250_000_000])
+
+    records = node.records
+    # The view reports timestamps in seconds
+    assert records == [
+        TimerRecord(begin=1.0, end=1.5),
+        TimerRecord(begin=2.0, end=2.25),
+        TimerRecord(begin=3.0, end=None),
+    ]
+    assert node.has_open_record()
+
+def test_build_stats_values():
+    """Checks every statistic produced by the single-pass build."""
+    node = TimerNode("test")
+    node.begins.extend([0, 1_000_000_000, 2_000_000_000, 3_000_000_000])
+    node.ends.extend([100_000_000, 1_300_000_000, 2_200_000_000, 3_400_000_000])
+
+    node.build_stats_recursive()
+    assert node.stats is not None
+    actual = (node.total_time, node.min_time, node.max_time,
+              node.avg_time, node.var_time)
+
+    assert actual == pytest.approx((1.0, 0.1, 0.4, 0.25, 0.0125))
+
+def test_properties_rebuild_stats_after_new_calls():
+    """Checks that lazily built stats are reused, then refreshed after end_record()."""
+    node = TimerNode("test")
+    node.begins.append(0)
+    node.ends.append(100_000_000)
+
+    assert node.total_time == pytest.approx(0.1)
+    stats = node.stats
+    assert node.max_time == pytest.approx(0.1)
+    assert node.stats is stats
+
+    node.begin_record()
+    node.end_record()
+    assert node.ncall == 2
+    assert node.stats is stats # Not rebuilt until read
+    assert node.total_time > 0.1
+    assert node.stats is not stats
+
+def test_to_tree_collects_open_nodes_in_depth_first_order():
+    """Checks that to_tree() reports open nodes in the same order as get_open_nodes()."""
+    time_prop = infer_time_property(1.0, "s", 2)
+    root = TimerNode("root")
+    root.begin_record()
+    first = root.get_or_create_branch("first")
+    first.begin_record()
+    first.get_or_create_branch("nested").begin_record()
+    root.get_or_create_branch("second").begin_record()
+
+    open_nodes: list[TimerNode] = []
+    root.to_tree(time_prop, open_nodes=open_nodes)
+
+    expected = ["root", "first", "nested", "second"]
+    assert [node.name for node in open_nodes] == expected
+    assert [node.name for node in root.get_open_nodes()] == expected
+
+def test_deep_nesting_does_not_recurse():
+    """Checks that traversals handle trees deeper than the recursion limit."""
+    time_prop = infer_time_property(1.0, "s", 2)
+    root = TimerNode("root")
+    node = root
+    for i in range(sys.getrecursionlimit() + 100):
+        node = node.get_or_create_branch(f"level_{i}")
+    node.begin_record()
+
+    assert root.get_open_nodes() == [node]
+    root.build_stats_recursive()
+    root.to_tree(time_prop)
+    assert "level_0" in root.to_dict()["children"]
+
+def test_variance_is_exact_for_large_offsets():
+    """Checks that variance keeps precision when durations share a large offset."""
+    node = TimerNode("test")
+    base = 10**12 # 1000s per call, differing by single nanoseconds
+    node.begins.extend([0, 0, 0])
+    node.ends.extend([base, base + 1, base + 2])
+
+    node.build_stats_recursive()
+    # Population variance of {0, 1, 2} ns is 2/3 ns^2
+    assert node.var_time == pytest.approx((2 / 3) / 1e18)
+
+def test_render_label_is_memoized_until_stats_change():
+    """Checks that labels are reused across renders and rebuilt after new calls."""
+    time_prop = infer_time_property(1.0, "s", 2)
+    node = TimerNode("test")
+    node.begin_record()
+    node.end_record()
+    node.build_stats_recursive()
+
+    label = node.render_label(time_prop, 10, 10, 2)
+    assert node.render_label(time_prop, 10, 10, 2) is label
+    assert node.render_label(time_prop, 10, 10, 2, verbose=True) is not label
+
+    node.begin_record()
+    node.end_record()
+    node.build_stats_recursive()
+    relabel = node.render_label(time_prop, 10, 10, 2)
+    assert relabel is not label
+    assert "2x" in relabel.plain
+
+def test_build_stats_recursive_skips_clean_nodes():
+    """Checks that only nodes with new calls get their stats rebuilt."""
+    root = TimerNode("root")
+    child = root.get_or_create_branch("child")
+    for node in (root, child):
+        node.begin_record()
+    child.end_record()
+    root.end_record()
+    root.build_stats_recursive()
+    root_stats, child_stats = root.stats, child.stats
+
+    child.begin_record()
+    child.end_record()
+    root.build_stats_recursive()
+
+    assert root.stats is root_stats
+    assert child.stats is not child_stats
+    assert child.ncall == 2
+
+def test_build_stats_single_call():
+    """Checks the single-call shortcut, including an open record after it."""
+    node = TimerNode("test")
+    node.begins.extend([1_000_000_000, 5_000_000_000])
+    node.ends.append(1_250_000_000)
+
+    node.build_stats_recursive()
+    assert node.ncall == 1
+    assert node.total_time == node.min_time == node.max_time == node.avg_time == 0.25
+    assert node.var_time == 0
+
+def test_iter_nodes_is_depth_first_preorder():
+    """Checks that iter_nodes() yields parents before children, in insertion order."""
+    root = TimerNode("root")
+    a = root.get_or_create_branch("a")
+    a.get_or_create_branch("a1")
+    a.get_or_create_branch("a2")
+    root.get_or_create_branch("b")
+
+    assert [node.name for node in root.iter_nodes()] == ["root", "a", "a1", "a2", "b"]
@@ -1,6 +1,6 @@
-import threading
 import time
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 from scope_timer import ScopeTimer
 from scope_timer.node import TimerNode
 
@@ -11,14 +11,12 @@ TOLERANCE = 0.15
 def worker(
     thread_id: int,
     n_loops: int,
-    sleep_interval: float,
-    results_list: List[Dict[str, TimerNode]],
-    lock: threading.Lock
-):
+    sleep_interval: float
+) -> Dict[str, TimerNode]:
     """
     Target function executed by each thread.
-    It measures time using thread-specific scope names and appends its results
-    to a shared list for the main thread to verify.
+    It measures time using thread-specific scope names and returns its results
+    for the main thread to verify.
     """
     # A unique root scope for each thread
     root_scope_name = f"thread_{thread_id}_root"
@@ -35,12 +33,11 @@ def worker(
                 with ScopeTimer.profile_block("grandchild_B1"):
                     time.sleep(sleep_interval / 4)
 
-    # Use a lock to safely append the thread-local results to the shared list
-    with lock:
-        results_list.append(ScopeTimer._local.root_nodes.copy())
+    results = ScopeTimer._local.root_nodes.copy()
 
-    # Clean up the thread-local data
+    # Clean up the thread-local data so a reused pool thread starts fresh
     ScopeTimer.reset()
+    return results
 
 def test_multithread_isolation():
     """
@@ -51,21 +48,12 @@ def test_multithread_isolation():
     n_loops = 5
     sleep_interval = 0.01
 
-    threads = []
-    results = []
-    lock = threading.Lock()
-
-    for i in range(n_threads):
-        thread = threading.Thread(
-            target=worker,
-            args=(i, n_loops, sleep_interval, results, lock)
-        )
-        threads.append(thread)
-        thread.start()
-
-    # Wait for all threads to complete
-    for thread in threads:
-        thread.join()
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        futures = [
+            executor.submit(worker, i, n_loops, sleep_interval)
+            for i in range(n_threads)
+        ]
+        results = [future.result() for future in futures]
 
     # --- Verification ---
 